@@ -1,25 +1,28 @@
+from startup import Startup, Lazy, build_hands, warm_up_hands
+startup = Startup()
+
 from flask import Flask, render_template, Response, jsonify
 import cv2
-import mediapipe as mp
 import numpy as np
 from dataclasses import dataclass
 from typing import Optional, Tuple, List
+import os
 import time
 
 # Import your chord matching
 from match_chord import match_chord
+from hand_features import landmarks_to_array, hand_features, z_heuristic, load_press_classifier, PressClassifier
 
 app = Flask(__name__)
 
-# MediaPipe setup
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=2,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
-mp_drawing = mp.solutions.drawing_utils
+# MediaPipe setup (imported and built by warm_up() in the background)
+hands = Lazy(lambda: build_hands(max_num_hands=2))
+startup.mark("imports")
+
+def warm_up():
+    """Start building + warming the hand model once; later calls are no-ops."""
+    if startup.mark("warm_up_started"):
+        startup.run_in_background(("hands_ready", warm_up_hands(hands)))
 
 # Constants
 NUM_STRINGS = 6
@@ -52,8 +55,10 @@ class FingerPosition:
     fret_num: int
 
 class FingerTracker:
-    def __init__(self):
+    def __init__(self, classifier: Optional[PressClassifier] = None):
         self.current_positions: List[FingerPosition] = []
+        # fitted weights (press_weights.npz) if present, else the original z-depth test
+        self.classifier = classifier if classifier is not None else load_press_classifier()
     
     def detect_position(self, tip_x, tip_y, region: FretboardRegion) -> Optional[Tuple[int, int]]:
         if not region:
@@ -104,27 +109,16 @@ class FingerTracker:
         self.current_positions.clear()
         positions = []
         
-        finger_tips = [
-            mp_hands.HandLandmark.INDEX_FINGER_TIP,
-            mp_hands.HandLandmark.MIDDLE_FINGER_TIP,
-            mp_hands.HandLandmark.RING_FINGER_TIP,
-            mp_hands.HandLandmark.PINKY_TIP
-        ]
-        
-        finger_mcps = [
-            mp_hands.HandLandmark.INDEX_FINGER_MCP,
-            mp_hands.HandLandmark.MIDDLE_FINGER_MCP,
-            mp_hands.HandLandmark.RING_FINGER_MCP,
-            mp_hands.HandLandmark.PINKY_MCP
-        ]
+        landmarks = landmarks_to_array(hand_landmarks)
+        quad = region.quad_corners.reshape(4, 2) if region.quad_corners is not None else None
+        features = hand_features(landmarks, (image_width, image_height), quad)
+        if self.classifier is not None:
+            pressing = self.classifier.predict(features["X"])
+        else:
+            pressing = z_heuristic(landmarks)
         
-        for i, (tip_idx, mcp_idx) in enumerate(zip(finger_tips, finger_mcps)):
-            tip = hand_landmarks.landmark[tip_idx]
-            mcp = hand_landmarks.landmark[mcp_idx]
-            tip_x = int(tip.x * image_width)
-            tip_y = int(tip.y * image_height)
-            
-            if tip.z < mcp.z - 0.02:
+        for i, (tip_x, tip_y) in enumerate(features["tips_px"].astype(int).tolist()):
+            if pressing[i]:
                 result = self.detect_position(tip_x, tip_y, region)
                 if result:
                     string_num, fret_num = result
@@ -183,9 +177,15 @@ manual_region = None
 def generate_frames():
     global manual_region
     
+    warm_up()
     cap = cv2.VideoCapture(0)
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+    startup.mark("camera_opened")
+    startup.wait()
+    import mediapipe as mp  # already loaded by the warm-up
+    mp_hands = mp.solutions.hands
+    mp_drawing = mp.solutions.drawing_utils
     
     # Hardcode fretboard region for now (you'll adjust these coordinates)
     # Format: top-left corner, top-right, bottom-right, bottom-left
@@ -220,7 +220,7 @@ def generate_frames():
         
         # Process with MediaPipe
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = hands.process(rgb_frame)
+        results = hands.get().process(rgb_frame)
         
         # Draw fretboard
         if manual_region:
@@ -274,6 +274,8 @@ def generate_frames():
         # Encode frame
         ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
         frame_bytes = buffer.tobytes()
+        if startup.mark("first_frame"):
+            print(startup.report())
         
         yield (b'--frame\r\n'
                b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
@@ -286,5 +288,13 @@ def index():
 def video_feed():
     return Response(generate_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
 
+@app.route('/startup')
+def startup_status():
+    return jsonify(startup.snapshot())
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5001, debug=True, threaded=True)
\ No newline at end of file
+    debug = True
+    # with the reloader on, only the serving child process needs the model
+    if not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        warm_up()
+    app.run(host='0.0.0.0', port=5001, debug=debug, threaded=True)
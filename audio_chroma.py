@@ -0,0 +1,295 @@
+import sys
+import threading
+import time
+import wave
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from match_chord import CHORD_NOTES
+
+PITCH_CLASSES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+FLAT_TO_SHARP = {"Db": "C#", "Eb": "D#", "Gb": "F#", "Ab": "G#", "Bb": "A#"}
+
+SAMPLE_RATE = 22050
+FRAME_SIZE = 4096          # ~186 ms at 22.05 kHz, enough resolution for low E (82 Hz)
+HOP_SIZE = 2048
+FMIN, FMAX = 70.0, 2000.0  # guitar fundamentals and first few harmonics
+
+
+def pitch_class(note):
+    return PITCH_CLASSES.index(FLAT_TO_SHARP.get(note, note))
+
+
+# ============================================================================
+# CHROMA - pitch-class profile of an audio buffer
+# ============================================================================
+@lru_cache(maxsize=8)
+def _pitch_class_matrix(sample_rate, frame_size):
+    """(n_bins, 12) matrix folding rfft power bins into pitch classes."""
+    freqs = np.fft.rfftfreq(frame_size, 1.0 / sample_rate)
+    bins = np.flatnonzero((freqs >= FMIN) & (freqs <= FMAX))
+    midi = 69 + 12 * np.log2(freqs[bins] / 440.0)
+    matrix = np.zeros((len(freqs), 12), dtype=np.float32)
+    matrix[bins, np.round(midi).astype(int) % 12] = 1.0
+    return matrix
+
+
+@lru_cache(maxsize=8)
+def _window(frame_size):
+    return np.hanning(frame_size).astype(np.float32)
+
+
+def chroma_from_buffer(samples, sample_rate=SAMPLE_RATE, frame_size=FRAME_SIZE, hop_size=HOP_SIZE):
+    """
+    12-bin pitch-class profile of a mono buffer, unit-normalized.
+    All windows are transformed in one batched rfft; returns zeros for silence.
+    """
+    samples = np.asarray(samples, dtype=np.float32).ravel()
+    if len(samples) < frame_size:
+        samples = np.pad(samples, (0, frame_size - len(samples)))
+    frames = sliding_window_view(samples, frame_size)[::hop_size]
+    power = np.abs(np.fft.rfft(frames * _window(frame_size), axis=1)) ** 2
+    chroma = power.sum(axis=0) @ _pitch_class_matrix(sample_rate, frame_size)
+    norm = np.linalg.norm(chroma)
+    return chroma / norm if norm > 0 else chroma
+
+
+# ============================================================================
+# CHORD TEMPLATES - expected pitch classes per chord from GuitarChords.csv
+# ============================================================================
+def chord_template(notes):
+    template = np.zeros(12, dtype=np.float32)
+    template[[pitch_class(n) for n in notes]] = 1.0
+    return template / np.linalg.norm(template)
+
+
+TEMPLATE_CHORDS = sorted(CHORD_NOTES)
+CHORD_TEMPLATES = np.stack([chord_template(CHORD_NOTES[c]) for c in TEMPLATE_CHORDS])
+
+
+def match_audio(chroma):
+    """
+    Match a chroma profile against every chord template.
+    :return: dict chord name -> cosine similarity (0..1)
+    """
+    scores = CHORD_TEMPLATES @ np.asarray(chroma, dtype=np.float32)
+    return dict(zip(TEMPLATE_CHORDS, scores.tolist()))
+
+
+def best_audio_match(chroma):
+    scores = CHORD_TEMPLATES @ np.asarray(chroma, dtype=np.float32)
+    i = int(np.argmax(scores))
+    return TEMPLATE_CHORDS[i], float(scores[i])
+
+
+def fuse_scores(vision_pct, audio_score, audio_weight=0.4):
+    """
+    Combine vision accuracy (0-100, or None) with audio similarity (0-1, or None).
+    Whichever signal is missing is left out; returns None if both are missing.
+    """
+    if audio_score is None:
+        return vision_pct
+    audio_pct = 100 * audio_score
+    if vision_pct is None:
+        return int(audio_pct)
+    return int((1 - audio_weight) * vision_pct + audio_weight * audio_pct)
+
+
+def verify_chord(chord_name, vision_pct, chroma, audio_weight=0.4):
+    """Fused score for the target chord. Returns (fused_pct, audio_score)."""
+    audio_score = None
+    if chroma is not None and chord_name in CHORD_NOTES and np.any(chroma):
+        audio_score = float(chroma @ CHORD_TEMPLATES[TEMPLATE_CHORDS.index(chord_name)])
+    return fuse_scores(vision_pct, audio_score, audio_weight), audio_score
+
+
+# ============================================================================
+# AUDIO I/O - WAV files and synthesized tones
+# ============================================================================
+def read_wav(path):
+    """Read an 8/16/24/32-bit PCM WAV file as mono float32 in [-1, 1]. Returns (samples, sample_rate)."""
+    with wave.open(path, "rb") as wf:
+        sample_rate = wf.getframerate()
+        n_channels = wf.getnchannels()
+        width = wf.getsampwidth()
+        raw = wf.readframes(wf.getnframes())
+
+    if width == 1:
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        data = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    elif width == 3:
+        # place each 3-byte sample in the top of an int32 so the sign bit lands correctly
+        padded = np.zeros((len(raw) // 3, 4), dtype=np.uint8)
+        padded[:, 1:] = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        data = padded.view("<i4").ravel().astype(np.float32) / 2147483648
+    elif width == 4:
+        data = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width} bytes")
+    return data.reshape(-1, n_channels).mean(axis=1), sample_rate
+
+
+def resample(samples, from_rate, to_rate):
+    """Linear-interpolation resampling; plenty for a chroma profile capped at FMAX."""
+    if from_rate == to_rate:
+        return samples
+    n_out = int(round(len(samples) * to_rate / from_rate))
+    t_out = np.arange(n_out) * (from_rate / to_rate)
+    return np.interp(t_out, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def synthesize_chord(chord_name, duration=1.0, sample_rate=SAMPLE_RATE, octave=3):
+    """Plucked-string-like tones for each note of a chord (test signal)."""
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    signal = np.zeros_like(t)
+    for note in CHORD_NOTES[chord_name]:
+        midi = 12 * (octave + 1) + pitch_class(note)
+        f0 = 440.0 * 2 ** ((midi - 69) / 12)
+        for harmonic, amp in ((1, 1.0), (2, 0.5), (3, 0.25)):
+            signal += amp * np.sin(2 * np.pi * f0 * harmonic * t)
+    signal *= np.exp(-2.0 * t)
+    return (signal / np.abs(signal).max()).astype(np.float32)
+
+
+# ============================================================================
+# STREAMING - bounded ring buffer + background analysis thread
+# ============================================================================
+class RingBuffer:
+    """Fixed-capacity sample buffer; writers overwrite the oldest audio and never block on readers."""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._write = 0
+        self._filled = 0
+        self._lock = threading.Lock()
+
+    def write(self, samples):
+        samples = np.asarray(samples, dtype=np.float32).ravel()[-self.capacity:]
+        n = len(samples)
+        with self._lock:
+            end = self._write + n
+            if end <= self.capacity:
+                self._data[self._write:end] = samples
+            else:
+                split = self.capacity - self._write
+                self._data[self._write:] = samples[:split]
+                self._data[:n - split] = samples[split:]
+            self._write = end % self.capacity
+            self._filled = min(self.capacity, self._filled + n)
+
+    def latest(self, n):
+        """Copy of the most recent min(n, filled) samples, oldest first."""
+        with self._lock:
+            n = min(n, self._filled)
+            start = (self._write - n) % self.capacity
+            if start + n <= self.capacity:
+                return self._data[start:start + n].copy()
+            return np.concatenate((self._data[start:], self._data[:self._write]))
+
+
+class AudioAnalyzer:
+    """
+    Runs chroma analysis on its own thread. Audio sources push samples into a
+    bounded RingBuffer; the video loop only reads the latest result.
+    """
+    def __init__(self, sample_rate=SAMPLE_RATE, window_seconds=0.5, interval=0.1, buffer_seconds=2.0):
+        self.sample_rate = sample_rate
+        self.window = int(window_seconds * sample_rate)
+        self.interval = interval
+        self.buffer = RingBuffer(int(buffer_seconds * sample_rate))
+        self._chroma = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def push(self, samples):
+        self.buffer.write(samples)
+
+    def latest_chroma(self):
+        with self._lock:
+            return self._chroma
+
+    def start(self):
+        self._spawn(self._analyze_loop)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+    def _spawn(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _analyze_loop(self):
+        while not self._stop.wait(self.interval):
+            samples = self.buffer.latest(self.window)
+            if len(samples) == 0:
+                continue
+            chroma = chroma_from_buffer(samples, self.sample_rate)
+            with self._lock:
+                self._chroma = chroma
+
+    def play_wav(self, path, loop=False, realtime=True, chunk=1024):
+        """Feed a WAV file into the buffer, paced like a live input when realtime is set.
+        Files at other sample rates (44.1 kHz, 48 kHz, ...) are resampled to the analyzer's."""
+        samples, sample_rate = read_wav(path)
+        samples = resample(samples, sample_rate, self.sample_rate)
+        sample_rate = self.sample_rate
+
+        def feed():
+            while not self._stop.is_set():
+                for i in range(0, len(samples), chunk):
+                    if self._stop.is_set():
+                        return
+                    self.push(samples[i:i + chunk])
+                    if realtime:
+                        time.sleep(chunk / sample_rate)
+                if not loop:
+                    return
+        self._spawn(feed)
+        return self
+
+    def open_microphone(self, device=None, chunk=1024):
+        """Stream from a live input. Needs the optional `sounddevice` package."""
+        try:
+            import sounddevice as sd
+        except ImportError as e:
+            raise ImportError("Live audio needs `pip install sounddevice`") from e
+
+        def callback(indata, frames, time_info, status):
+            self.push(indata[:, 0])
+
+        stream = sd.InputStream(samplerate=self.sample_rate, channels=1, blocksize=chunk,
+                                device=device, callback=callback)
+        stream.start()
+
+        def close_on_stop():
+            self._stop.wait()
+            stream.stop()
+            stream.close()
+        self._spawn(close_on_stop)
+        return self
+
+
+if __name__ == "__main__":
+    # Self-check: synthesized chords (or a WAV given on the command line) through the matcher
+    if len(sys.argv) > 1:
+        samples, sample_rate = read_wav(sys.argv[1])
+        chord, score = best_audio_match(chroma_from_buffer(samples, sample_rate))
+        print(f"{sys.argv[1]}: {chord} ({score:.2f})")
+        sys.exit(0)
+
+    correct = 0
+    t0 = time.perf_counter()
+    for chord_name in TEMPLATE_CHORDS:
+        chord, score = best_audio_match(chroma_from_buffer(synthesize_chord(chord_name)))
+        correct += chord == chord_name
+        print(f"{chord_name:>7} -> {chord:<7} {score:.2f}")
+    elapsed_ms = (time.perf_counter() - t0) * 1000 / len(TEMPLATE_CHORDS)
+    print(f"{correct}/{len(TEMPLATE_CHORDS)} correct, {elapsed_ms:.1f} ms per 1 s clip")
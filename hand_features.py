@@ -0,0 +1,206 @@
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from map_fret_board import CANONICAL_QUAD
+
+NUM_LANDMARKS = 21
+WRIST = 0
+MIDDLE_MCP = 9
+FINGER_NAMES = ["index", "middle", "ring", "pinky"]
+
+# wrist -> MCP -> PIP -> DIP -> TIP chain for each finger, shape (4, 5)
+FINGER_CHAINS = np.array([[0, 5, 6, 7, 8],
+                          [0, 9, 10, 11, 12],
+                          [0, 13, 14, 15, 16],
+                          [0, 17, 18, 19, 20]])
+TIP_IDS = FINGER_CHAINS[:, -1]
+MCP_IDS = FINGER_CHAINS[:, 1]
+
+FEATURE_NAMES = ["depth", "curl", "dip_angle", "on_board"]
+
+# fitted weights written by `python hand_features.py RECORDING.npz press_weights.npz`
+PRESS_WEIGHTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "press_weights.npz")
+
+
+# ============================================================================
+# LANDMARKS -> NUMPY
+# ============================================================================
+# Serialized NormalizedLandmark submessage layout (proto2 writes every set field):
+#   0x0a <len> 0x0d <x:f4> 0x15 <y:f4> 0x1d <z:f4> [0x25 <visibility:f4> 0x2d <presence:f4>]
+# record size -> (byte offset, expected byte) pairs that identify the layout
+_LAYOUT_BYTES = {
+    17: [(0, 0x0a), (1, 15), (2, 0x0d), (7, 0x15), (12, 0x1d)],
+    27: [(0, 0x0a), (1, 25), (2, 0x0d), (7, 0x15), (12, 0x1d), (17, 0x25), (22, 0x2d)],
+}
+_WIRE_LAYOUTS = {size: [(offset, bytes([value]) * NUM_LANDMARKS) for offset, value in checks]
+                 for size, checks in _LAYOUT_BYTES.items()}
+
+
+def landmarks_to_array(hand_landmarks):
+    """
+    Convert a MediaPipe NormalizedLandmarkList to a (21, 3) float32 array of
+    normalized x, y, z. Reads the floats straight out of the serialized protobuf
+    through a strided view instead of 63 Python attribute reads; falls back to
+    attribute access if the wire layout is unexpected.
+    """
+    raw = hand_landmarks.SerializeToString()
+    size, rem = divmod(len(raw), NUM_LANDMARKS)
+    checks = _WIRE_LAYOUTS.get(size) if rem == 0 else None
+    if checks and all(raw[offset::size] == expected for offset, expected in checks):
+        return np.ndarray((NUM_LANDMARKS, 3), dtype="<f4", buffer=raw, offset=3, strides=(size, 5)).copy()
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+
+
+# ============================================================================
+# FEATURES - batched over any leading shape (..., 21, 3)
+# ============================================================================
+def _angle_between(a, b):
+    cos = np.einsum('...k,...k->...', a, b) / (np.linalg.norm(a, axis=-1) * np.linalg.norm(b, axis=-1) + 1e-9)
+    return np.arccos(np.clip(cos, -1.0, 1.0))
+
+
+def to_board(points, quad):
+    """Map (..., 2) screen points into fretboard-canonical coords given a (4,2) TL,TR,BR,BL quad."""
+    H = cv2.getPerspectiveTransform(np.asarray(quad, dtype=np.float32), CANONICAL_QUAD)
+    pts = np.asarray(points, dtype=np.float32)
+    return cv2.perspectiveTransform(pts.reshape(-1, 1, 2), H).reshape(pts.shape)
+
+
+def hand_features(landmarks, image_size, quad=None, board_margin=0.05):
+    """
+    Pose-normalized per-finger features.
+    landmarks: (..., 21, 3) normalized MediaPipe coords
+    image_size: (width, height) of the frame the landmarks came from
+    quad: fretboard corners in the same (pixel) frame, or None
+    Returns dict with tips_px (..., 4, 2), tips_board (..., 4, 2) or None,
+    curl / depth / on_board (..., 4) and the stacked feature matrix X (..., 4, F).
+    """
+    w, h = image_size
+    pts = np.asarray(landmarks, dtype=np.float32) * np.array([w, h, w], dtype=np.float32)
+
+    # hand scale: wrist -> middle MCP in the image plane
+    scale = np.linalg.norm(pts[..., MIDDLE_MCP, :2] - pts[..., WRIST, :2], axis=-1)[..., None] + 1e-6
+
+    chains = pts[..., FINGER_CHAINS, :]               # (..., 4, 5, 3)
+    bones = np.diff(chains, axis=-2)                  # (..., 4, 4, 3)
+    joint_angles = _angle_between(bones[..., :-1, :], bones[..., 1:, :])  # (..., 4, 3) MCP, PIP, DIP
+    curl = joint_angles.sum(axis=-1)
+    dip_angle = joint_angles[..., -1]
+
+    # positive when the tip is nearer the camera than its knuckle (pressing into the neck)
+    depth = (pts[..., MCP_IDS, 2] - pts[..., TIP_IDS, 2]) / scale
+
+    tips_px = pts[..., TIP_IDS, :2]
+    tips_board = None
+    on_board = np.ones_like(curl)
+    if quad is not None:
+        tips_board = to_board(tips_px, quad)
+        inside = (tips_board >= -board_margin) & (tips_board <= 1 + board_margin)
+        on_board = inside.all(axis=-1).astype(np.float32)
+
+    X = np.stack((depth, curl, dip_angle, on_board), axis=-1)
+    return {"tips_px": tips_px, "tips_board": tips_board, "curl": curl,
+            "depth": depth, "on_board": on_board, "X": X}
+
+
+def z_heuristic(landmarks, threshold=0.02):
+    """The original press test: tip.z < mcp.z - 0.02, batched. Returns (..., 4) bool."""
+    lm = np.asarray(landmarks)
+    return lm[..., TIP_IDS, 2] < lm[..., MCP_IDS, 2] - threshold
+
+
+# ============================================================================
+# PRESS CLASSIFIER - logistic regression over the per-finger features
+# ============================================================================
+class PressClassifier:
+    # hand-tuned starting point only (a curled finger on the board with its tip toward
+    # the camera); apps use fitted weights via load_press_classifier, else z_heuristic
+    DEFAULT_WEIGHTS = np.array([8.0, 1.0, 0.5, 2.5], dtype=np.float32)
+    DEFAULT_BIAS = -4.5
+
+    def __init__(self, weights=None, bias=None, threshold=0.5):
+        self.weights = np.array(self.DEFAULT_WEIGHTS if weights is None else weights, dtype=np.float32)
+        self.bias = float(self.DEFAULT_BIAS if bias is None else bias)
+        self.threshold = threshold
+
+    def predict_proba(self, X):
+        return 1.0 / (1.0 + np.exp(-(X @ self.weights + self.bias)))
+
+    def predict(self, X):
+        return self.predict_proba(X) >= self.threshold
+
+    def fit(self, X, y, lr=0.1, epochs=500, l2=1e-3):
+        """Batch gradient descent on logistic loss. X: (..., F), y: (...) bool."""
+        X = np.asarray(X, dtype=np.float32).reshape(-1, len(self.weights))
+        y = np.asarray(y, dtype=np.float32).ravel()
+        mu, sigma = X.mean(axis=0), X.std(axis=0) + 1e-6
+        Xn = (X - mu) / sigma
+        w = np.zeros(X.shape[1], dtype=np.float32)
+        b = 0.0
+        for _ in range(epochs):
+            err = 1.0 / (1.0 + np.exp(-(Xn @ w + b))) - y
+            w -= lr * (Xn.T @ err / len(y) + l2 * w)
+            b -= lr * err.mean()
+        # fold the standardization back into the weights
+        self.weights = (w / sigma).astype(np.float32)
+        self.bias = float(b - (w * mu / sigma).sum())
+        return self
+
+    def save(self, path):
+        np.savez(path, weights=self.weights, bias=self.bias, threshold=self.threshold)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data["weights"], float(data["bias"]), float(data["threshold"]))
+
+
+def load_press_classifier(path=PRESS_WEIGHTS_PATH):
+    """Fitted PressClassifier if a weights file exists, else None (callers fall back to z_heuristic)."""
+    return PressClassifier.load(path) if path and os.path.exists(path) else None
+
+
+def _scores(pred, labels):
+    pred, labels = np.asarray(pred, bool).ravel(), np.asarray(labels, bool).ravel()
+    tp = (pred & labels).sum()
+    precision = tp / max(pred.sum(), 1)
+    recall = tp / max(labels.sum(), 1)
+    f1 = 2 * precision * recall / max(precision + recall, 1e-9)
+    return (pred == labels).mean(), f1
+
+
+if __name__ == "__main__":
+    # Benchmark the classifier against the z heuristic on a recording made with
+    # `python main.py --record take.npz` (landmarks, quads, labels, image_size).
+    if len(sys.argv) < 2:
+        print("usage: python hand_features.py RECORDING.npz [WEIGHTS_OUT.npz]")
+        print(f"       save to {os.path.basename(PRESS_WEIGHTS_PATH)} to make the apps use the fitted classifier")
+        sys.exit(1)
+
+    rec = np.load(sys.argv[1])
+    landmarks, quads, labels = rec["landmarks"], rec["quads"], rec["labels"]
+    image_size = tuple(rec["image_size"])
+    n = len(landmarks)
+
+    t0 = time.perf_counter()
+    X = np.stack([hand_features(lm, image_size, None if np.isnan(q).any() else q)["X"]
+                  for lm, q in zip(landmarks, quads)])
+    per_frame_us = (time.perf_counter() - t0) / n * 1e6
+
+    split = n // 2
+    fitted = PressClassifier().fit(X[:split], labels[:split])
+    rows = [("z heuristic", z_heuristic(landmarks[split:])),
+            ("classifier (defaults)", PressClassifier().predict(X[split:])),
+            ("classifier (fitted)", fitted.predict(X[split:]))]
+
+    print(f"{n} frames, features {per_frame_us:.1f} us/frame, evaluated on last {n - split}")
+    for name, pred in rows:
+        acc, f1 = _scores(pred, labels[split:])
+        print(f"{name:>22}: accuracy {acc:.3f}  F1 {f1:.3f}")
+    if len(sys.argv) > 2:
+        fitted.save(sys.argv[2])
+        print(f"saved fitted weights to {sys.argv[2]}")
@@ -1,25 +1,58 @@
+from startup import Startup, warm_up_hands, warm_up_detector
+startup = Startup()
+
+import argparse
+import time
 import cv2
-import mediapipe as mp
 import math
+import map_hands
+import map_fret_board
 from map_hands import get_fingertip_positions
 from map_fret_board import map_guitar
 from graphics_code import draw_chord_diagram
 import graphics_code
 
 from match_chord import match_chord
-
-mp_hands = mp.solutions.hands
-mp_draw = mp.solutions.drawing_utils
-
-thumb_indices = {(0,1), (1,2), (2,3), (3,4)}
-custom_connections = [conn for conn in mp_hands.HAND_CONNECTIONS if conn not in thumb_indices]
+from progression import load_chart, ProgressionScorer
+from hand_features import landmarks_to_array
+import numpy as np
+
+parser = argparse.ArgumentParser(description="Computer Vision Guitar Tutor")
+parser.add_argument("--song", help="chord chart (.txt or .json) to play along with")
+parser.add_argument("--audio", action="store_true", help="verify chords from the microphone (needs sounddevice)")
+parser.add_argument("--audio-wav", help="verify chords against a recorded WAV file instead of the microphone")
+parser.add_argument("--record", help="save hand landmarks labelled with the current chord's fingers (.npz) "
+                                     "for benchmarking the press classifier")
+args = parser.parse_args()
+startup.mark("imports")
+
+# Build + warm up the detectors in the background while the camera opens
+startup.run_in_background(("aruco_ready", warm_up_detector(map_fret_board.detector)),
+                          ("hands_ready", warm_up_hands(map_hands.hands)))
 
 string_labels = ["E", "A", "D", "G", "B", "E"]
 
 cap = cv2.VideoCapture(0)
+startup.mark("camera_opened")
 
 current_chord = "C"  # <-- set this dynamically if needed
 
+# Progression mode: chord follows the chart timeline instead of the number keys
+scorer = ProgressionScorer(load_chart(args.song)) if args.song else None
+
+# Press-classifier recording: fingers the current chord uses are labelled as pressing
+recorded = {"landmarks": [], "quads": [], "labels": []}
+
+# Audio verification runs on its own thread; the loop below only reads its latest chroma
+analyzer = None
+if args.audio_wav or args.audio:
+    from audio_chroma import AudioAnalyzer, verify_chord
+    analyzer = AudioAnalyzer().start()
+    if args.audio_wav:
+        analyzer.play_wav(args.audio_wav, loop=True)
+    else:
+        analyzer.open_microphone()
+
 
 # Utility: compute accuracy of observed fingertips vs expected chord points
 def compute_chord_accuracy(expected_positions, observed_points, max_distance=80):
@@ -78,15 +111,24 @@ def compute_accuracy_from_lists(expected_list, observed_list, max_distance=80):
     return pct, details
 
 
+startup.wait()
+song_start = time.perf_counter()  # the song clock starts once detectors are warm
+
 while True:
     ret, frame = cap.read()
     if not ret:
         break
 
     raw_frame = frame.copy()
-    display, fret_positions, string_positions = map_guitar(frame)
+    display, fret_positions, string_positions, quad = map_guitar(frame)
     _, fingertips, landmarks_list = get_fingertip_positions(raw_frame)
 
+    if args.record and landmarks_list and current_chord:
+        chord_fingers = graphics_code.CHORD_LIBRARY[current_chord]['fingers']
+        recorded["landmarks"].append(landmarks_to_array(landmarks_list[0]))
+        recorded["quads"].append(quad if quad is not None else np.full((4, 2), np.nan, dtype=np.float32))
+        recorded["labels"].append([f in chord_fingers for f in (1, 2, 3, 4)])
+
     # After mapping the guitar and getting fret/string positions:
     if fret_positions and string_positions:
         fret_xs = [x for (x,y) in fret_positions]
@@ -134,7 +176,32 @@ while True:
     expected_screen_positions = []
     observed_screen_points = [ (x,y) for (_, (x,y)) in fingertips.items() ]
 
-    if current_chord and fret_positions and string_positions:
+    score = None
+    if scorer:
+        song_time = time.perf_counter() - song_start
+        score = scorer.update(song_time, quad, observed_screen_points)
+        if score is None:
+            summary = scorer.summary()
+            print(f"Song finished: {summary['changes_made']}/{summary['chords']} changes made, "
+                  f"mean accuracy {summary['mean_accuracy']}, "
+                  f"mean timing error {summary['mean_abs_timing_error']} s")
+            scorer = None
+        else:
+            current_chord = score.chord
+
+    if score and score.expected_screen is not None:
+        for (x, y), finger_num in zip(score.expected_screen.astype(int).tolist(), score.fingers):
+            cv2.circle(display, (x, y), 8, (0, 255, 255), -1)
+            cv2.circle(display, (x, y), 8, (255, 255, 255), 2)
+            cv2.putText(display, str(finger_num), (x-7, y+7),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 2)
+        next_idx = score.index + 1
+        if next_idx < len(scorer.progression):
+            remaining = scorer.progression.starts[next_idx] - song_time
+            cv2.putText(display, f"Next: {scorer.progression.chords[next_idx]} in {remaining:.1f}s", (20, 90),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+    elif current_chord and fret_positions and string_positions:
         for string_idx, fret in enumerate(graphics_code.CHORD_LIBRARY[current_chord]['frets']):
             finger_num = graphics_code.CHORD_LIBRARY[current_chord]['fingers'][string_idx]
             if fret is not None and fret > 0 and finger_num:
@@ -155,13 +222,25 @@ while True:
                 expected_screen_positions.append((x,y))
 
     # compute accuracy between observed_screen_points and expected_screen_positions (only when expected exists)
-    if expected_screen_positions:
+    pct = None
+    if score and score.accuracy is not None:
+        # progression mode: already scored against the song timeline above
+        pct = score.accuracy
+        cv2.putText(display, f"Accuracy: {pct}%", (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0,255,0) if pct==100 else (0,165,255), 2)
+    elif expected_screen_positions:
         pct, details = compute_accuracy_from_lists(expected_screen_positions, observed_screen_points, max_distance=60)
         cv2.putText(display, f"Accuracy: {pct}%", (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0,255,0) if pct==100 else (0,165,255), 2)
     else:
         # no expected points (open chord/no fretted notes) - show N/A
         cv2.putText(display, f"Accuracy: N/A", (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (200,200,200), 2)
 
+    # fuse vision accuracy with how well the strings actually ring
+    if analyzer and current_chord:
+        fused, audio_score = verify_chord(current_chord, pct, analyzer.latest_chroma())
+        if audio_score is not None:
+            cv2.putText(display, f"Audio: {int(100 * audio_score)}%  Overall: {fused}%", (20, 120),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0,255,0) if fused >= 80 else (0,165,255), 2)
+
 
     # Draw chord diagram on the frame
     draw_chord_diagram(
@@ -183,6 +262,8 @@ while True:
                 cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
 
     cv2.imshow("Hand + Guitar Tracking", display)
+    if startup.mark("first_frame"):
+        print(startup.report())
 
     key = cv2.waitKey(1) & 0xFF
     if key == 27:  # ESC
@@ -205,5 +286,11 @@ while True:
         current_chord = "G"
 
 
+if analyzer:
+    analyzer.stop()
+if args.record and recorded["landmarks"]:
+    np.savez(args.record, landmarks=np.stack(recorded["landmarks"]), quads=np.stack(recorded["quads"]),
+             labels=np.array(recorded["labels"]), image_size=np.array([display.shape[1], display.shape[0]]))
+    print(f"Saved {len(recorded['landmarks'])} frames to {args.record}")
 cap.release()
 cv2.destroyAllWindows()
@@ -2,11 +2,15 @@ import cv2
 import cv2.aruco as aruco
 import numpy as np
 from collections import deque
+from startup import Lazy
 
-# ArUco setup
-aruco_dict = aruco.getPredefinedDictionary(aruco.DICT_4X4_1000)
-parameters = aruco.DetectorParameters()
-detector = aruco.ArucoDetector(aruco_dict, parameters)
+# ArUco setup (built on first use or by the startup warm-up)
+def _build_detector():
+    aruco_dict = aruco.getPredefinedDictionary(aruco.DICT_4X4_1000)
+    parameters = aruco.DetectorParameters()
+    return aruco.ArucoDetector(aruco_dict, parameters)
+
+detector = Lazy(_build_detector)
 
 valid_ids = {0, 1, 2, 3}
 history = {i: deque(maxlen=5) for i in valid_ids}
@@ -15,12 +19,34 @@ last_seen = {}
 # Standard tuning (low E to high E)
 string_labels = ["E", "A", "D", "G", "B", "E"]
 
+NUM_FRETS = 12
+NUM_STRINGS = 6
+
+def fret_offsets(num_frets=NUM_FRETS):
+    """Fraction along the TL->BL edge of each fret line (rule of 18 spacing, 
+    doubled so the marked quad covers the first half of the scale)."""
+    offsets = []
+    prev_frac = 0
+    for _ in range(num_frets):
+        fret_frac = prev_frac + (1 - prev_frac) / 17.817
+        offsets.append(fret_frac * 2)
+        prev_frac = fret_frac
+    return np.array(offsets, dtype=np.float32)
+
+FRET_OFFSETS = fret_offsets()
+
+# Fretboard-canonical coordinates: the ArUco quad (TL, TR, BR, BL) maps onto the
+# unit square. Strings run along v (u = string_idx / 5, low E at u = 0) and frets
+# run along u (v = FRET_OFFSETS[fret - 1]), matching the lines map_guitar draws.
+CANONICAL_QUAD = np.float32([[0, 0], [1, 0], [1, 1], [0, 1]])
+
 def map_guitar(frame):
     """Process a frame, detect ArUco fretboard, draw frets + strings, 
-    return annotated display + fret/string positions."""
+    return annotated display + fret/string positions + fretboard quad 
+    (TL, TR, BR, BL as a (4,2) float32 array, or None if incomplete)."""
     h, w = frame.shape[:2]
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    corners, ids, _ = detector.detectMarkers(gray)
+    corners, ids, _ = detector.get().detectMarkers(gray)
 
     display = cv2.flip(frame, 1)
     quad_points = {}
@@ -58,6 +84,7 @@ def map_guitar(frame):
     # draw fretboard if complete
     fret_positions = []
     string_positions = []
+    quad = None
 
     if len(quad_points) == 4:
         pts = np.array([quad_points["TL"], quad_points["TR"],
@@ -69,28 +96,26 @@ def map_guitar(frame):
         BL = np.array(quad_points["BL"], dtype=np.float32)
         BR = np.array(quad_points["BR"], dtype=np.float32)
 
+        quad = np.array([TL, TR, BR, BL], dtype=np.float32)
+
         left_edge_vec  = BL - TL
         right_edge_vec = BR - TR
 
         # frets
-        prev_frac = 0
-        num_frets = 12
-        for n in range(1, num_frets + 1):
-            fret_frac = prev_frac + (1 - prev_frac) / 17.817
-            fret_left  = TL + left_edge_vec * fret_frac * 2
-            fret_right = TR + right_edge_vec * fret_frac * 2
+        for n, offset in enumerate(FRET_OFFSETS, start=1):
+            fret_left  = TL + left_edge_vec * offset
+            fret_right = TR + right_edge_vec * offset
             cv2.line(display, tuple(fret_left.astype(int)), tuple(fret_right.astype(int)), (0, 255, 255), 2)
             cv2.putText(display, f"{n}", tuple((fret_left + [5, -5]).astype(int)),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
 
             fret_positions.append((int(fret_left[0]), int(fret_left[1])))  # store x,y of left edge
-            prev_frac = fret_frac
 
         # strings
-        upper_edge  = np.linspace(quad_points["BR"], quad_points["BL"], 6)
-        lower_edge  = np.linspace(quad_points["TR"], quad_points["TL"], 6)
+        upper_edge  = np.linspace(quad_points["BR"], quad_points["BL"], NUM_STRINGS)
+        lower_edge  = np.linspace(quad_points["TR"], quad_points["TL"], NUM_STRINGS)
 
-        for i in range(6):
+        for i in range(NUM_STRINGS):
             p1 = tuple(upper_edge[i].astype(int))
             p2 = tuple(lower_edge[i].astype(int))
             cv2.line(display, p1, p2, (155,255,0), 2)
@@ -100,4 +125,4 @@ def map_guitar(frame):
 
             string_positions.append(((p1[0]+p2[0])//2, (p1[1]+p2[1])//2))  # midpoint
 
-    return display, fret_positions, string_positions
\ No newline at end of file
+    return display, fret_positions, string_positions, quad
@@ -1,15 +1,11 @@
 import cv2
-import mediapipe as mp
 from collections import deque
 import numpy as np
+from hand_features import landmarks_to_array, TIP_IDS
+from startup import Lazy, build_hands
 
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=1,          # only track one hand
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
+# MediaPipe is imported and the model built on first use (or by the startup warm-up)
+hands = Lazy(lambda: build_hands(max_num_hands=1))  # only track one hand
 
 FINGER_TIPS = {"index": 8, "middle": 12, "ring": 16, "pinky": 20}
 
@@ -19,7 +15,7 @@ finger_history = {name: deque(maxlen=5) for name in FINGER_TIPS.keys()}
 def get_fingertip_positions(frame):
     frame = cv2.flip(frame, 1)
     rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands.process(rgb)
+    results = hands.get().process(rgb)
 
     tips = {}
     landmarks_list = []
@@ -29,17 +25,14 @@ def get_fingertip_positions(frame):
         hand_landmarks = results.multi_hand_landmarks[0]
         landmarks_list.append(hand_landmarks)
 
-        for name, finger_id in FINGER_TIPS.items():
-            lm = hand_landmarks.landmark[finger_id]
-            x = int(lm.x * w)
-            y = int(lm.y * h)
-
+        # all four tips in one array op instead of per-landmark attribute reads
+        tips_px = (landmarks_to_array(hand_landmarks)[TIP_IDS, :2] * (w, h)).astype(int)
+        for name, (x, y) in zip(FINGER_TIPS, tips_px.tolist()):
             # Always append (no visibility filter)
             finger_history[name].append((x, y))
 
             # Average over history
-            avg_x = int(np.mean([p[0] for p in finger_history[name]]))
-            avg_y = int(np.mean([p[1] for p in finger_history[name]]))
+            avg_x, avg_y = np.mean(finger_history[name], axis=0).astype(int).tolist()
             tips[name] = (avg_x, avg_y)
 
     return frame, tips, landmarks_list
\ No newline at end of file
@@ -1,21 +1,42 @@
-import pandas as pd
+from startup import Lazy
 
-df = pd.read_csv("./GuitarChords.csv")
-df.drop(columns=["Capo", "Key", "Note Order", "Note", "Roman Numeral"], axis=1, inplace=True)
-df.drop_duplicates(subset=["Chord", "Finger Label", "Guitar String", "Fret"], inplace=True)
-df.dropna(subset=["Finger Label"], inplace=True)
-df["Fret"] = df["Fret"].replace("x", 0)
-df["Fret"] = df["Fret"].astype(int)
-# print(df)
 
-CHORDS = {}
+def _load_chords():
+    import pandas as pd  # deferred: only needed once a chord is actually matched
 
-#iterate through dataframe and populate CHORDS dictionary
-for chord_name, group in df.groupby("Chord"):
-    positions = list(zip(group["Finger Label"], group["Guitar String"], group["Fret"]))
-    CHORDS[chord_name] = positions
+    df = pd.read_csv("./GuitarChords.csv")
+
+    # pitch classes sounded by each chord (used for audio verification)
+    chord_notes = {chord_name: sorted(set(notes.dropna()))
+                   for chord_name, notes in df.groupby("Chord")["Note"]}
+
+    df.drop(columns=["Capo", "Key", "Note Order", "Note", "Roman Numeral"], axis=1, inplace=True)
+    df.drop_duplicates(subset=["Chord", "Finger Label", "Guitar String", "Fret"], inplace=True)
+    df.dropna(subset=["Finger Label"], inplace=True)
+    df["Fret"] = df["Fret"].replace("x", 0)
+    df["Fret"] = df["Fret"].astype(int)
+    # print(df)
+
+    chords = {}
+
+    #iterate through dataframe and populate CHORDS dictionary
+    for chord_name, group in df.groupby("Chord"):
+        positions = list(zip(group["Finger Label"], group["Guitar String"], group["Fret"]))
+        chords[chord_name] = positions
+
+    # print(CHORDS) #(finger num, string num, fret num)
+    return {"df": df, "CHORDS": chords, "CHORD_NOTES": chord_notes}
+
+
+chord_data = Lazy(_load_chords)
+
+
+def __getattr__(name):
+    # df, CHORDS and CHORD_NOTES stay importable as module attributes but load on first access
+    if name in ("df", "CHORDS", "CHORD_NOTES"):
+        return chord_data.get()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# print(CHORDS) #(finger num, string num, fret num)
 
 def match_chord(finger_positions):
     """
@@ -23,8 +44,7 @@ def match_chord(finger_positions):
     :param finger_positions: (finger num, string num, fret num)
     :return: Matched chord name or None
     """
-    for chord_name, positions in CHORDS.items():
+    for chord_name, positions in chord_data.get()["CHORDS"].items():
         if all(pos in finger_positions for pos in positions):
             return chord_name
     return None
-
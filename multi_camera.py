@@ -0,0 +1,265 @@
+import argparse
+import multiprocessing
+import queue
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from map_fret_board import FRET_OFFSETS, NUM_FRETS, NUM_STRINGS
+from hand_features import FINGER_NAMES
+
+QUEUE_SIZE = 8  # per source
+
+
+@dataclass
+class SourceResult:
+    source_id: int
+    timestamp: float                      # session seconds (media time for video files)
+    tips_board: Optional[np.ndarray]      # (4, 2) fretboard-canonical tip positions, None if not tracked
+    confidence: Optional[np.ndarray]      # (4,) per-finger press confidence in [0, 1]
+
+
+@dataclass
+class FingerEstimate:
+    finger_name: str
+    string_idx: int       # 0 = low E, matching CHORD_LIBRARY order
+    fret: int
+    confidence: float
+
+
+def parse_source(source):
+    """'0', '1', ... open a camera index; anything else is a video file path."""
+    return int(source) if str(source).isdigit() else source
+
+
+# ============================================================================
+# WORKER - one process per source (map_guitar / map_hands keep per-process state)
+# ============================================================================
+def _source_worker(source_id, source, out_queue, stop_event, t_start, live):
+    import map_hands
+    from map_fret_board import map_guitar
+    from hand_features import landmarks_to_array, hand_features, z_heuristic, load_press_classifier
+    from startup import warm_up_hands
+
+    cap = None
+    try:
+        warm_up_hands(map_hands.hands)()
+        classifier = load_press_classifier()
+        cap = cv2.VideoCapture(parse_source(source))
+        if not cap.isOpened():
+            raise RuntimeError(f"cannot open source {source!r}")
+        while not stop_event.is_set():
+            ok, frame = cap.read()
+            if not ok:
+                break
+            timestamp = time.monotonic() - t_start if live else cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+            h, w = frame.shape[:2]
+
+            _, _, _, quad = map_guitar(frame)
+            _, _, landmarks_list = map_hands.get_fingertip_positions(frame)
+
+            result = SourceResult(source_id, timestamp, None, None)
+            if quad is not None and landmarks_list:
+                landmarks = landmarks_to_array(landmarks_list[0])
+                features = hand_features(landmarks, (w, h), quad)
+                if classifier is not None:
+                    press = classifier.predict_proba(features["X"])
+                else:
+                    press = z_heuristic(landmarks).astype(np.float32)
+                confidence = press * features["on_board"]
+                result = SourceResult(source_id, timestamp, features["tips_board"], confidence)
+
+            if live:
+                # live cameras never wait on a slow consumer: drop this source's oldest
+                # result to make room, so the consumer always sees the freshest frames
+                try:
+                    out_queue.put_nowait(result)
+                except queue.Full:
+                    try:
+                        out_queue.get_nowait()
+                    except queue.Empty:
+                        pass
+                    try:
+                        out_queue.put_nowait(result)
+                    except queue.Full:
+                        pass
+            else:
+                out_queue.put(result)
+    finally:
+        if cap is not None:
+            cap.release()
+        out_queue.put(source_id)  # end-of-stream marker
+
+
+# ============================================================================
+# ALIGNMENT + FUSION
+# ============================================================================
+class TimestampAligner:
+    """
+    Groups per-source results whose timestamps fall within `tolerance` seconds.
+    Groups are emitted once every live source has buffered something, so a
+    source that loses the hand still contributes an (untracked) result.
+    """
+    def __init__(self, n_sources, tolerance=0.05):
+        self.buffers = [deque() for _ in range(n_sources)]
+        self.finished = [False] * n_sources
+        self.tolerance = tolerance
+
+    def push(self, result: SourceResult):
+        self.buffers[result.source_id].append(result)
+
+    def finish(self, source_id):
+        self.finished[source_id] = True
+
+    def pop_groups(self):
+        """Yield (timestamp, [SourceResult or None per source]) for every complete group."""
+        while True:
+            waiting = any(not buf and not done for buf, done in zip(self.buffers, self.finished))
+            heads = [buf[0].timestamp for buf in self.buffers if buf]
+            if waiting or not heads:
+                return
+            t = min(heads)
+            group = [buf.popleft() if buf and buf[0].timestamp - t <= self.tolerance else None
+                     for buf in self.buffers]
+            yield t, group
+
+
+def fuse_estimates(group: List[Optional[SourceResult]], min_confidence=0.5):
+    """
+    Confidence-weighted fusion of per-source tip positions in fretboard-canonical
+    coordinates. Returns a list of FingerEstimate (one per finger pressing with
+    combined confidence >= min_confidence).
+    """
+    tracked = [r for r in group if r is not None and r.tips_board is not None]
+    if not tracked:
+        return []
+    positions = np.stack([r.tips_board for r in tracked])        # (S, 4, 2)
+    confidence = np.stack([r.confidence for r in tracked])        # (S, 4)
+
+    weight_sum = confidence.sum(axis=0)
+    fused = (confidence[..., None] * positions).sum(axis=0) / np.maximum(weight_sum, 1e-9)[:, None]
+    # probability at least one view sees the finger pressing
+    combined = 1.0 - np.prod(1.0 - confidence, axis=0)
+
+    string_idx = np.clip(np.rint(fused[:, 0] * (NUM_STRINGS - 1)), 0, NUM_STRINGS - 1).astype(int)
+    fret = np.minimum(np.searchsorted(FRET_OFFSETS, fused[:, 1]) + 1, NUM_FRETS)
+
+    return [FingerEstimate(FINGER_NAMES[i], int(string_idx[i]), int(fret[i]), float(combined[i]))
+            for i in range(len(FINGER_NAMES))
+            if weight_sum[i] > 0 and combined[i] >= min_confidence]
+
+
+# ============================================================================
+# MULTI-SOURCE RUNNER
+# ============================================================================
+class MultiSource:
+    """
+    Runs the fretboard + hand pipeline for several cameras / video files in
+    parallel worker processes and yields timestamp-aligned, fused estimates.
+    """
+    def __init__(self, sources, tolerance=0.05, min_confidence=0.5):
+        self.sources = list(sources)
+        self.live = any(isinstance(parse_source(s), int) for s in self.sources)
+        self.min_confidence = min_confidence
+        self.aligner = TimestampAligner(len(self.sources), tolerance)
+        self.frames_per_source = [0] * len(self.sources)
+
+        ctx = multiprocessing.get_context("spawn")  # MediaPipe state must not be forked
+        # one bounded queue per source so a fast camera cannot crowd out the others
+        self._queues = [ctx.Queue(maxsize=QUEUE_SIZE) for _ in self.sources]
+        self._stop = ctx.Event()
+        t_start = time.monotonic()
+        self._workers = [ctx.Process(target=_source_worker, daemon=True,
+                                     args=(i, s, q, self._stop, t_start, self.live))
+                         for i, (s, q) in enumerate(zip(self.sources, self._queues))]
+
+    def __iter__(self):
+        """Yield (timestamp, fused FingerEstimates, per-source group) until all sources end."""
+        for worker in self._workers:
+            worker.start()
+        try:
+            while not all(self.aligner.finished):
+                # the aligner can only emit once every unfinished source has buffered a
+                # result, so read from exactly the sources it is waiting on
+                for i in range(len(self.sources)):
+                    if not self.aligner.finished[i] and not self.aligner.buffers[i]:
+                        self._receive(i)
+                for t, group in self.aligner.pop_groups():
+                    yield t, fuse_estimates(group, self.min_confidence), group
+        finally:
+            self.stop()
+        failed = [str(s) for s, w in zip(self.sources, self._workers) if w.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"Worker failed for source(s): {', '.join(failed)}")
+
+    def _receive(self, i):
+        """Block for source i's next result or end-of-stream marker."""
+        while True:
+            try:
+                item = self._queues[i].get(timeout=0.5)
+                break
+            except queue.Empty:
+                if not self._workers[i].is_alive() and self._queues[i].empty():
+                    item = i  # worker died without sending its marker
+                    break
+        if isinstance(item, int):
+            self.aligner.finish(item)
+        else:
+            self.frames_per_source[i] += 1
+            self.aligner.push(item)
+
+    def stop(self):
+        self._stop.set()
+        # drain so workers blocked on a full queue can exit
+        while any(w.is_alive() for w in self._workers):
+            for q in self._queues:
+                try:
+                    q.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+        for worker in self._workers:
+            worker.join()
+
+
+def run(sources, tolerance=0.05, verbose=True):
+    """Process sources to the end; returns (fused groups, wall seconds, frames per source)."""
+    multi = MultiSource(sources, tolerance)
+    t0 = None
+    groups = 0
+    for t, estimates, group in multi:
+        # clock starts at the first fused group so worker spawn + warm-up is excluded
+        t0 = t0 or time.perf_counter()
+        groups += 1
+        if verbose:
+            seen = sum(r is not None and r.tips_board is not None for r in group)
+            fingers = ", ".join(f"{e.finger_name}: S{e.string_idx + 1} F{e.fret} ({e.confidence:.2f})"
+                                for e in estimates) or "no pressed fingers"
+            print(f"t={t:7.3f}s  views tracking {seen}/{len(group)}  {fingers}")
+    wall = time.perf_counter() - t0 if t0 else 0.0
+    return groups, wall, multi.frames_per_source
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fuse finger positions from several cameras or video files")
+    parser.add_argument("sources", nargs="+", help="camera indices (0, 1, ...) or video file paths")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="timestamp alignment window in seconds")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="report throughput for 1..N sources instead of printing estimates")
+    args = parser.parse_args()
+
+    if not args.benchmark:
+        run(args.sources, args.tolerance)
+    else:
+        # throughput scaling per added source (use video files so every run sees the same frames)
+        base_fps = None
+        print(f"{'sources':>7} {'frames':>7} {'wall s':>7} {'frames/s':>9} {'fused/s':>8} {'scaling':>8}")
+        for n in range(1, len(args.sources) + 1):
+            groups, wall, frames = run(args.sources[:n], args.tolerance, verbose=False)
+            fps = sum(frames) / wall if wall else 0.0
+            base_fps = base_fps or fps
+            scaling = fps / base_fps if base_fps else 0.0
+            print(f"{n:>7} {sum(frames):>7} {wall:>7.2f} {fps:>9.1f} {groups / max(wall, 1e-9):>8.1f} {scaling:>7.2f}x")
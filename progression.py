@@ -0,0 +1,252 @@
+import bisect
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+import graphics_code
+from map_fret_board import CANONICAL_QUAD, FRET_OFFSETS, NUM_STRINGS
+
+# ============================================================================
+# FRETBOARD-CANONICAL COORDINATES (see map_fret_board.CANONICAL_QUAD)
+# ============================================================================
+def chord_canonical_points(chord_name):
+    """Expected fingertip positions for a chord in canonical coordinates.
+    Returns ((N,2) float32 array, list of N finger numbers)."""
+    chord_info = graphics_code.CHORD_LIBRARY[chord_name]
+    points = []
+    fingers = []
+    for string_idx, fret in enumerate(chord_info['frets']):
+        finger_num = chord_info['fingers'][string_idx]
+        if fret is not None and fret > 0 and finger_num:
+            u = string_idx / (NUM_STRINGS - 1)
+            v = FRET_OFFSETS[min(fret, len(FRET_OFFSETS)) - 1]
+            points.append((u, v))
+            fingers.append(finger_num)
+    return np.array(points, dtype=np.float32).reshape(-1, 2), fingers
+
+
+# ============================================================================
+# PROGRESSION - chord timeline loaded from a chart
+# ============================================================================
+class Progression:
+    def __init__(self, chords, beats, bpm=60):
+        if not chords:
+            raise ValueError("Progression needs at least one chord")
+        if len(chords) != len(beats):
+            raise ValueError("chords and beats must have the same length")
+        unknown = sorted(set(chords) - set(graphics_code.CHORD_LIBRARY))
+        if unknown:
+            raise ValueError(f"Unknown chord(s) in progression: {', '.join(unknown)}")
+        if bpm <= 0:
+            raise ValueError(f"bpm must be positive, got {bpm}")
+        if any(b <= 0 for b in beats):
+            raise ValueError("every chord needs a positive number of beats")
+
+        self.chords = list(chords)
+        self.bpm = bpm
+        seconds = np.asarray(beats, dtype=np.float64) * 60.0 / bpm
+        self.starts = np.concatenate(([0.0], np.cumsum(seconds)[:-1]))
+        self.ends = self.starts + seconds
+        self.duration = float(self.ends[-1])
+        # plain list so per-frame lookups are a C-level bisect, no array boxing
+        self._starts = self.starts.tolist()
+
+        # canonical points are computed once per distinct chord, not per frame
+        self.expected: Dict[str, np.ndarray] = {}
+        self.fingers: Dict[str, List[int]] = {}
+        for chord_name in set(self.chords):
+            self.expected[chord_name], self.fingers[chord_name] = chord_canonical_points(chord_name)
+
+    def __len__(self):
+        return len(self.chords)
+
+    def index_at(self, t):
+        """Index of the segment playing at time t (seconds), None outside the song."""
+        if t < 0 or t >= self.duration:
+            return None
+        return bisect.bisect_right(self._starts, t) - 1
+
+
+def load_chart(path):
+    """
+    Load a chord chart.
+    Text charts: one "<chord> <beats>" per line, optional "bpm <n>" line, # comments.
+    JSON charts: {"bpm": 90, "chords": [["C", 4], {"chord": "G", "beats": 4}, ...]}
+    """
+    chords, beats = [], []
+    bpm = 60
+
+    if path.endswith(".json"):
+        with open(path) as f:
+            data = json.load(f)
+        bpm = float(data.get("bpm", bpm))
+        for entry in data["chords"]:
+            if isinstance(entry, dict):
+                chords.append(entry["chord"])
+                beats.append(float(entry.get("beats", 4)))
+            else:
+                chords.append(entry[0])
+                beats.append(float(entry[1]) if len(entry) > 1 else 4.0)
+    else:
+        with open(path) as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                parts = line.split()
+                try:
+                    if parts[0].lower() == "bpm":
+                        if len(parts) != 2:
+                            raise ValueError("expected 'bpm <n>'")
+                        bpm = float(parts[1])
+                        if bpm <= 0:
+                            raise ValueError(f"bpm must be positive, got {parts[1]}")
+                        continue
+                    if len(parts) > 2:
+                        raise ValueError("expected '<chord> <beats>'")
+                    n_beats = float(parts[1]) if len(parts) > 1 else 4.0
+                    if n_beats <= 0:
+                        raise ValueError(f"beats must be positive, got {parts[1]}")
+                except ValueError as e:
+                    raise ValueError(f"{path}:{line_no}: {e} in {line!r}") from None
+                chords.append(parts[0])
+                beats.append(n_beats)
+
+    return Progression(chords, beats, bpm)
+
+
+# ============================================================================
+# SCORING - per-frame accuracy and chord-change timing
+# ============================================================================
+@dataclass
+class FrameScore:
+    index: int
+    chord: str
+    accuracy: Optional[int]                   # percent, None if fretboard not visible
+    expected_screen: Optional[np.ndarray]     # (N,2) screen positions of the current chord
+    fingers: List[int] = field(default_factory=list)
+
+
+def _matched(expected, observed, max_distance):
+    """Boolean per expected point: is any observed point within max_distance."""
+    if len(observed) == 0:
+        return np.zeros(len(expected), dtype=bool)
+    diff = expected[:, None, :] - observed[None, :, :]
+    return np.einsum('ijk,ijk->ij', diff, diff).min(axis=1) <= max_distance ** 2
+
+
+class ProgressionScorer:
+    """
+    Scores a player against a Progression frame by frame.
+    A chord change counts as made the first time accuracy reaches hit_threshold;
+    changes made up to early_window seconds before the segment starts are
+    credited with a negative timing error.
+    """
+    def __init__(self, progression: Progression, max_distance=60, hit_threshold=100, early_window=0.5):
+        self.progression = progression
+        self.max_distance = max_distance
+        self.hit_threshold = hit_threshold
+        self.early_window = early_window
+
+        n = len(progression)
+        self.hit_times = np.full(n, np.nan)
+        self.accuracy_sum = np.zeros(n)
+        self.scored_frames = np.zeros(n, dtype=np.int64)
+
+    def update(self, t, quad, observed_points) -> Optional[FrameScore]:
+        """
+        t: seconds since the song started
+        quad: (4,2) fretboard corners TL, TR, BR, BL in screen coords (or None)
+        observed_points: iterable of (x, y) fingertips in the same screen coords
+        Returns FrameScore, or None once the song is over.
+        """
+        prog = self.progression
+        idx = prog.index_at(t)
+        if idx is None:
+            return None
+        chord = prog.chords[idx]
+        current = prog.expected[chord]
+
+        if quad is None:
+            return FrameScore(idx, chord, None, None, prog.fingers[chord])
+
+        # look ahead to the next chord so early changes are timed too
+        nxt = idx + 1
+        check_next = (nxt < len(prog)
+                      and np.isnan(self.hit_times[nxt])
+                      and prog.chords[nxt] != chord
+                      and t >= prog.starts[nxt] - self.early_window)
+        canonical = np.concatenate((current, prog.expected[prog.chords[nxt]])) if check_next else current
+
+        # one homography per frame, applied to every expected point at once
+        H = cv2.getPerspectiveTransform(CANONICAL_QUAD, np.asarray(quad, dtype=np.float32))
+        screen = cv2.perspectiveTransform(canonical.reshape(-1, 1, 2), H).reshape(-1, 2)
+        observed = np.asarray(list(observed_points), dtype=np.float32).reshape(-1, 2)
+        matched = _matched(screen, observed, self.max_distance)
+
+        n_cur = len(current)
+        pct = int(100 * matched[:n_cur].sum() / n_cur) if n_cur else None
+        if pct is not None:
+            self.accuracy_sum[idx] += pct
+            self.scored_frames[idx] += 1
+            if pct >= self.hit_threshold and np.isnan(self.hit_times[idx]):
+                self.hit_times[idx] = t
+        # only credit an early change once the current chord is let go, otherwise a next
+        # chord whose points are a subset of this one (E -> Em) is "reached" while holding it
+        if check_next and matched[n_cur:].size and not matched[:n_cur].all():
+            if 100 * matched[n_cur:].sum() / matched[n_cur:].size >= self.hit_threshold:
+                self.hit_times[nxt] = t
+
+        return FrameScore(idx, chord, pct, screen[:n_cur], prog.fingers[chord])
+
+    def timing_errors(self):
+        """Seconds between each segment start and the player reaching the chord (NaN if missed)."""
+        return self.hit_times - self.progression.starts
+
+    def summary(self):
+        errors = self.timing_errors()
+        made = ~np.isnan(errors)
+        scored = self.scored_frames > 0
+        per_segment_acc = np.divide(self.accuracy_sum, self.scored_frames,
+                                    out=np.full(len(errors), np.nan), where=scored)
+        return {
+            "chords": len(errors),
+            "changes_made": int(made.sum()),
+            "changes_missed": int((~made).sum()),
+            "mean_accuracy": float(np.nanmean(per_segment_acc)) if scored.any() else None,
+            "mean_abs_timing_error": float(np.abs(errors[made]).mean()) if made.any() else None,
+            "per_segment": [
+                {"chord": c, "start": float(s),
+                 "accuracy": None if np.isnan(a) else float(a),
+                 "timing_error": None if np.isnan(e) else float(e)}
+                for c, s, a, e in zip(self.progression.chords, self.progression.starts, per_segment_acc, errors)
+            ],
+        }
+
+
+if __name__ == "__main__":
+    # Benchmark: a long song scored frame by frame at 30 fps must stay far below 33 ms/frame
+    names = list(graphics_code.CHORD_LIBRARY)
+    n_chords = 5000
+    t0 = time.perf_counter()
+    prog = Progression([names[i % len(names)] for i in range(n_chords)], [4] * n_chords, bpm=120)
+    load_ms = (time.perf_counter() - t0) * 1000
+
+    scorer = ProgressionScorer(prog)
+    quad = np.float32([[300, 150], [900, 170], [880, 420], [320, 400]])
+    rng = np.random.default_rng(0)
+    fps = 30
+    n_frames = int(prog.duration * fps)
+    tips = rng.uniform(200, 900, size=(n_frames, 4, 2)).astype(np.float32)
+
+    t0 = time.perf_counter()
+    for f in range(n_frames):
+        scorer.update(f / fps, quad, tips[f])
+    per_frame_us = (time.perf_counter() - t0) / n_frames * 1e6
+
+    print(f"{n_chords} chords ({prog.duration / 60:.0f} min): load {load_ms:.1f} ms")
+    print(f"{n_frames} frames scored: {per_frame_us:.1f} us/frame (budget {1e6 / fps:.0f} us)")
@@ -0,0 +1,171 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+WARMUP_SIZE = (480, 640)  # (height, width) of the synthetic warm-up frame
+
+
+# ============================================================================
+# LAZY - heavy objects built once, on first use or ahead of time
+# ============================================================================
+class Lazy:
+    """Builds a heavy object (model, detector, dataset) once, on first get().
+    Thread-safe, so a background thread can build it while the caller waits."""
+    def __init__(self, build):
+        self._build = build
+        self._value = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    self._value = self._build()
+        return self._value
+
+
+def build_hands(max_num_hands=1):
+    import mediapipe as mp  # ~1 s import, deferred until a detector is actually needed
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=max_num_hands,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+
+
+def synthetic_frame(height=WARMUP_SIZE[0], width=WARMUP_SIZE[1]):
+    """Deterministic noise frame (BGR/RGB agnostic) for warm-up inference."""
+    return np.random.default_rng(0).integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+
+# ============================================================================
+# STARTUP - background build + warm-up with time-to-first-frame report
+# ============================================================================
+class Startup:
+    """
+    Records startup milestones (seconds since construction) and runs warm-up
+    tasks on a background thread so they overlap with opening the camera.
+    """
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.marks = {}
+        self._marks_lock = threading.Lock()  # marked from warm-up and request threads
+        self._ready = threading.Event()
+        self._error = None
+
+    def mark(self, label):
+        """Record the first time a milestone is reached. Returns True if this call recorded it."""
+        with self._marks_lock:
+            if label in self.marks:
+                return False
+            self.marks[label] = time.perf_counter() - self.t0
+            return True
+
+    def run_in_background(self, *tasks):
+        """tasks: (label, callable) pairs, run in order; each is marked when done."""
+        def run():
+            try:
+                for label, task in tasks:
+                    task()
+                    self.mark(label)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._ready.set()
+        threading.Thread(target=run, daemon=True).start()
+        return self
+
+    def wait(self, timeout=None):
+        """Block until background tasks finish; re-raises anything they raised."""
+        self._ready.wait(timeout)
+        if self._error is not None:
+            raise self._error
+        self.mark("ready")
+
+    def snapshot(self):
+        """Copy of the milestones, safe to read while other threads are marking."""
+        with self._marks_lock:
+            return dict(self.marks)
+
+    def report(self):
+        return "Startup: " + " | ".join(f"{label} {t:.2f}s" for label, t in self.snapshot().items())
+
+
+def warm_up_hands(hands_lazy):
+    """Build the MediaPipe model and pay its first-inference cost on a synthetic frame."""
+    def task():
+        hands_lazy.get().process(synthetic_frame())
+    return task
+
+
+def warm_up_detector(detector_lazy):
+    def task():
+        detector_lazy.get().detectMarkers(synthetic_frame()[:, :, 0])
+    return task
+
+
+# ============================================================================
+# BENCHMARK - cold import time and time-to-first-result in fresh interpreters
+# ============================================================================
+IMPORT_TARGETS = ["numpy", "cv2", "pandas", "mediapipe",
+                  "map_fret_board", "map_hands", "match_chord", "progression"]
+
+
+def _probe_first_result(warm):
+    """Time from process start-up work to the first hand-tracking result."""
+    t0 = time.perf_counter()
+    import map_hands
+    frame = synthetic_frame()
+    if warm:
+        startup = Startup().run_in_background(("hands", warm_up_hands(map_hands.hands)))
+        startup.wait()
+    ready = time.perf_counter()
+    map_hands.get_fingertip_positions(frame)
+    first = time.perf_counter()
+    map_hands.get_fingertip_positions(frame)
+    second = time.perf_counter()
+    return {"setup_s": ready - t0, "first_frame_s": first - ready,
+            "steady_frame_s": second - first, "time_to_first_result_s": first - t0}
+
+
+# runs with nothing but the stdlib preloaded, so each module pays its own import cost
+_IMPORT_PROBE = "import sys, time; t = time.perf_counter(); __import__(sys.argv[1]); print(time.perf_counter() - t)"
+
+
+def _import_time(module):
+    out = subprocess.run([sys.executable, "-c", _IMPORT_PROBE, module],
+                         cwd=os.path.dirname(os.path.abspath(__file__)),
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _first_result_time(mode):
+    out = subprocess.run([sys.executable, __file__, "--probe", mode],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--probe":
+        print(json.dumps(_probe_first_result(sys.argv[2] == "warm")))
+        sys.exit(0)
+
+    # Each measurement runs in a fresh interpreter so import caches don't hide cold costs
+    print("Cold import time")
+    for module in IMPORT_TARGETS:
+        try:
+            print(f"  {module:>15}: {_import_time(module) * 1000:7.1f} ms")
+        except subprocess.CalledProcessError as e:
+            print(f"  {module:>15}: failed ({e.stderr.strip().splitlines()[-1]})")
+
+    print("Time to first hand-tracking result")
+    for mode in ("cold", "warm"):
+        r = _first_result_time(mode)
+        print(f"  {mode}: setup {r['setup_s'] * 1000:.0f} ms, first frame {r['first_frame_s'] * 1000:.0f} ms, "
+              f"steady frame {r['steady_frame_s'] * 1000:.0f} ms, total {r['time_to_first_result_s'] * 1000:.0f} ms")